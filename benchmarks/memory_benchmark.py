@@ -0,0 +1,253 @@
+"""Compares peak memory use of the podcast models with and without slots, of downloading a synthetic catalog of
+podcasts with every podcast queued up front and through the download window, and of the write buffers with and
+without a shared pool.
+
+Usage: python3 benchmarks/memory_benchmark.py [course count] [podcasts per course]
+"""
+
+import concurrent.futures
+import contextlib
+import itertools
+import os
+import runpy
+import sys
+import tempfile
+import threading
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lecturehoarder")
+sys.path.insert(0, PACKAGE_DIR)
+
+from logic import PodcastFilter, PodcastProvider, WriteBehindWriter, WriteBufferPool  # noqa: E402
+from model import Course, Download, DownloadStatus, Podcast, Profile  # noqa: E402
+
+# run_path returns a copy of the module globals, so patch the globals the functions actually use
+lecture_hoarder = runpy.run_path(os.path.join(PACKAGE_DIR, "__main__.py"), run_name="memory_benchmark")
+lecture_hoarder = lecture_hoarder["main"].__globals__
+
+# Update the download list as fast as possible, dropping finished downloads straight away and printing nothing
+lecture_hoarder["REFRESH_INTERVAL"] = 0
+lecture_hoarder["STALE_DOWNLOAD_TIME"] = -1
+lecture_hoarder["print_download_queue"] = lambda queue, settings: 0
+
+
+class DictPodcast:
+    """The podcast model as it was before slots were used, storing its attributes in a dictionary."""
+
+    def __init__(self, name: str, date: datetime, url: str):
+        self.name = name
+        self.date = date
+        self.url = url
+
+
+class DictDownload:
+    """The download model as it was before slots were used, storing its attributes in a dictionary."""
+
+    def __init__(self, podcast: DictPodcast, download_path: str, staging_path: str = None):
+        self.podcast = podcast
+        self.download_path = download_path
+        self.staging_path = staging_path
+        self.status = DownloadStatus.WAITING
+        self.error_message = None
+        self.progress = 0
+        self.total_size = 0
+        self.completion_time = None
+
+
+class PreallocatedWriteBufferPool(WriteBufferPool):
+    """A buffer pool with every buffer allocated up front, as each download allocated its buffers before they were
+    shared."""
+
+    def __init__(self, buffer_size: int, buffer_count: int):
+        super().__init__(buffer_size, buffer_count)
+
+        for _ in range(self.buffer_count):
+            self.release(bytearray(self.buffer_size))
+        self.allocated = self.buffer_count
+
+
+class SyntheticResponse:
+    """An empty podcast download response."""
+
+    status_code: int = 200
+    headers: Dict[str, str] = {"Content-Length": "0"}
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        return iter(())
+
+    def close(self) -> None:
+        pass
+
+
+class SyntheticPodcastProvider(PodcastProvider):
+    """Provides a synthetic catalog of podcasts without making any requests."""
+
+    course_count: int = 0
+    podcasts_per_course: int = 0
+
+    def __init__(self, settings_profile: Profile, course_count: int, podcasts_per_course: int):
+        super().__init__(settings_profile)
+
+        self.course_count = course_count
+        self.podcasts_per_course = podcasts_per_course
+
+    def login(self, username: str, password: str) -> bool:
+        return True
+
+    def get_course_list(self) -> Iterator[Course]:
+        return (Course(f"COMP{number:05d} Synthetic Course {number}", f"/lectures/{number}", "2019-20")
+                for number in range(self.course_count))
+
+    def get_course_podcasts(self, course: Course) -> Iterator[Podcast]:
+        start = datetime(2020, 1, 1)
+        return (Podcast(f"{course.name} Lecture {number}", start - timedelta(days=number),
+                        f"{course.url}/podcast/{number}")
+                for number in range(self.podcasts_per_course))
+
+    def get_podcast_source(self, podcast: Podcast) -> str:
+        return podcast.url
+
+    def get_podcast_downloader(self, podcast: Podcast, start_byte: int = 0,
+                               podcast_src: Optional[str] = None) -> SyntheticResponse:
+        return SyntheticResponse()
+
+
+class CompletingExecutor(concurrent.futures.Executor):
+    """Completes each submitted download immediately, without downloading anything."""
+
+    def submit(self, fn, *args, **kwargs) -> concurrent.futures.Future:
+        args[0].set_complete()
+
+        future = concurrent.futures.Future()
+        future.set_result(None)
+        return future
+
+
+def measure(run: Callable[[], int]) -> int:
+    """Measures the peak memory allocated whilst running a function.
+
+    :param run: The function to run.
+    :return:    The peak memory allocated, in bytes.
+    """
+
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    """Runs the benchmark."""
+
+    course_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    podcasts_per_course = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        run_benchmark(course_count, podcasts_per_course, base_dir)
+
+
+def run_benchmark(course_count: int, podcasts_per_course: int, base_dir: str) -> None:
+    """Runs the benchmark, saving podcasts to the specified directory.
+
+    :param course_count:        The number of synthetic courses.
+    :param podcasts_per_course: The number of synthetic podcasts in each course.
+    :param base_dir:            The directory to save podcasts to.
+    """
+
+    settings = Profile()
+    settings.base_dir = base_dir
+    settings.lookahead_downloads = 0
+    provider = SyntheticPodcastProvider(settings, course_count, podcasts_per_course)
+    podcast_count = course_count * podcasts_per_course
+    window_size = max(settings.max_queued_downloads, settings.concurrent_downloads)
+
+    def create_models(podcast_type, download_type) -> Callable[[], int]:
+        def create() -> int:
+            start = datetime(2020, 1, 1)
+            models = [download_type(podcast_type(f"Lecture {number}", start - timedelta(days=number),
+                                                 f"/lectures/podcast/{number}"),
+                                    os.path.join(base_dir, f"Lecture {number}.mp4"))
+                      for number in range(podcast_count)]
+            return len(models)
+
+        return create
+
+    def generate() -> Iterator[Download]:
+        return lecture_hoarder["generate_downloads"](provider.get_course_list(), provider, settings,
+                                                     PodcastFilter(settings))
+
+    def download(queue_size: int) -> Callable[[], int]:
+        def run() -> int:
+            downloads = generate()
+            queue = list(itertools.islice(downloads, queue_size))
+            lecture_hoarder["download_queue"](queue, downloads, provider, settings, CompletingExecutor())
+            return len(queue)
+
+        return run
+
+    allocated = {}  # Write buffer memory allocated over each run, keyed by whether the pool was shared
+
+    def write_downloads(shared: bool, download_count: int, download_size: int) -> Callable[[], int]:
+        def run() -> int:
+            shared_pool = WriteBufferPool(settings.write_buffer_size,
+                                          settings.concurrent_downloads * settings.write_buffer_count)
+            unshared_allocated = []
+            chunk = bytes(lecture_hoarder["DOWNLOAD_CHUNK_SIZE"])
+
+            def write(count: int) -> None:
+                for _ in range(count):
+                    pool = shared_pool if shared else \
+                        PreallocatedWriteBufferPool(settings.write_buffer_size, settings.write_buffer_count)
+
+                    with open(os.devnull, "wb") as f:
+                        writer = WriteBehindWriter(f, pool, settings.write_buffer_count)
+                        for _ in range(download_size // len(chunk)):
+                            writer.write(chunk)
+                        writer.close()
+
+                    if not shared:
+                        unshared_allocated.append(pool.allocated * pool.buffer_size)
+
+            threads = [threading.Thread(target=write, args=(download_count // settings.concurrent_downloads,))
+                       for _ in range(settings.concurrent_downloads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            allocated[shared] = shared_pool.allocated * shared_pool.buffer_size if shared else sum(unshared_allocated)
+            return download_count
+
+        return run
+
+    dict_models_peak = measure(create_models(DictPodcast, DictDownload))
+    slot_models_peak = measure(create_models(Podcast, Download))
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        all_peak = measure(download(podcast_count))
+        windowed_peak = measure(download(window_size))
+
+    write_count = 64
+    write_size = 4 * 1024 * 1024
+    unshared_peak = measure(write_downloads(False, write_count, write_size))
+    shared_peak = measure(write_downloads(True, write_count, write_size))
+
+    print(f"Catalog: {course_count} courses x {podcasts_per_course} podcasts = {podcast_count} podcasts")
+    print(f"Models with dictionaries:  {dict_models_peak / 1000000:8.1f} MB peak")
+    print(f"Models with slots:         {slot_models_peak / 1000000:8.1f} MB peak")
+    print(f"Queue everything up front: {all_peak / 1000000:8.1f} MB peak")
+    print(f"Download window of {window_size}:     {windowed_peak / 1000000:8.1f} MB peak")
+    print(f"Writing {write_count} downloads of {write_size // (1024 * 1024)} MiB, "
+          f"{settings.concurrent_downloads} at a time:")
+    print(f"Write buffers per download: {unshared_peak / 1000000:7.1f} MB peak, "
+          f"{allocated[False] / 1000000:8.1f} MB allocated")
+    print(f"Shared write buffer pool:   {shared_peak / 1000000:7.1f} MB peak, "
+          f"{allocated[True] / 1000000:8.1f} MB allocated")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,50 @@
 """Main command line entry point for lecture-hoarder."""
 
+import argparse
+import atexit
 import concurrent.futures
 import getpass
+import itertools
 import os
 import re
 import signal
 import string
 import sys
+import threading
 import time
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+import requests
 from yaml import YAMLError
 
-from logic import PodcastProvider, PodcastProviderError, UomPodcastProvider
-from model import Download, DownloadStatus, Profile
+from logic import PodcastCache, PodcastCacheServer, PodcastFilter, PodcastMover, PodcastProvider, \
+    PodcastProviderError, PodcastResolver, RunProfiler, UomPodcastProvider, WriteBehindWriter, WriteBufferPool
+from model import Course, Download, DownloadStatus, Profile
 
 # The list of characters that can be used in filenames
 VALID_FILE_CHARS = f"-_.() {string.ascii_letters}{string.digits}"
 
+# The number of bytes to read from the network at a time
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# The maximum number of seconds to wait for downloads to stop after being cancelled
+CANCEL_TIMEOUT = 10
+
+# The number of seconds between updates of the download list
+REFRESH_INTERVAL = 0.3
+
+# The number of seconds finished downloads stay in the download list
+STALE_DOWNLOAD_TIME = 3
+
+# The path prefix for profiling output files when no path is given
+DEFAULT_PROFILE_PATH = "lecture-hoarder-profile"
+
+# Set whilst podcasts are being downloaded, so that sigint cancels the downloads rather than exiting immediately
+downloading_event = threading.Event()
+
+# Set when the user has asked for the downloads to stop
+cancel_event = threading.Event()
+
 
 def filter_path_name(path: str) -> str:
     """Filters all invalid characters from a file path name.
@@ -40,44 +67,193 @@ def format_size(size_in_bytes: int) -> str:
 
 
 def handle_sigint(signal, frame) -> None:
-    """Gracefully exit after sigint (Ctrl-C) signal."""
+    """Gracefully exit after sigint (Ctrl-C) signal.
+
+    Whilst downloading, the first signal asks the downloads to stop and save their progress. A second signal exits
+    immediately.
+    """
+
+    if downloading_event.is_set() and not cancel_event.is_set():
+        cancel_event.set()
+        return
 
     print("Terminated by user")
+
+    if downloading_event.is_set():
+        # Download threads may still be running, so do not wait for them
+        sys.stdout.flush()
+        os._exit(1)
+
     sys.exit(0)
 
 
+def get_resume_offset(partial_path: str) -> int:
+    """Gets the byte offset an interrupted download can be resumed from.
+
+    Only the bytes recorded when the download was cancelled are trusted, as the rest of the partial file may not have
+    reached the disk.
+
+    :param partial_path:    The path of the partial download.
+    :return:                The byte offset to resume from, or 0 to start again.
+    """
+
+    try:
+        with open(partial_path + ".offset", "r") as f:
+            offset = int(f.read())
+        return offset if 0 < offset <= os.path.getsize(partial_path) else 0
+    except (OSError, ValueError):
+        return 0
+
+
+def save_resume_offset(partial_path: str, offset: int) -> None:
+    """Records the byte offset an interrupted download can be resumed from.
+
+    :param partial_path:    The path of the partial download, which must already be flushed to disk.
+    :param offset:          The number of bytes downloaded.
+    """
+
+    with open(partial_path + ".offset", "w") as f:
+        f.write(str(offset))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def get_download_response(download: Download, web_provider: PodcastProvider,
+                          podcast_src: Optional[str] = None) -> Tuple[requests.Response, int]:
+    """Gets the HTTP response for a download, resuming from a previously cancelled download if there is one.
+
+    :param download:        The download to get the response for.
+    :param web_provider:    The podcast provider.
+    :param podcast_src:     The download source URL, if resolved ahead of time.
+
+    :raises PodcastProviderError: If an error occurs getting the response, or the response is not usable.
+
+    :return: The download response, and the byte the download is resumed from.
+    """
+
+    start_byte = get_resume_offset(download.partial_path)
+    http_download_response = web_provider.get_podcast_downloader(download.podcast, start_byte, podcast_src)
+
+    # Check the response can be streamed straight to disk
+    if not http_download_response.headers.get("Content-Length", "").isdigit():
+        http_download_response.close()
+        raise PodcastProviderError(f"Could not get download size for {download.podcast.name}")
+
+    return http_download_response, start_byte
+
+
 # Downloads a podcast using the href and a target location.
 # Logging messages will use the name to identify which podcast download request it is related to.
-def download_podcast(download: Download, web_provider: PodcastProvider) -> None:
+def download_podcast(download: Download, web_provider: PodcastProvider, settings: Profile,
+                     resolver: Optional[PodcastResolver], mover: Optional[PodcastMover], buffer_pool: WriteBufferPool,
+                     cancel: threading.Event) -> None:
     """Executes a queued download operation.
 
     :param download:        The download operation to perform.
     :param web_provider:    The podcast provider.
+    :param settings:        The program settings profile.
+    :param resolver:        Resolves download sources ahead of time, if lookahead is used.
+    :param mover:           Moves the download from the staging directory once complete, if staging is used.
+    :param buffer_pool:     The write buffers shared between downloads.
+    :param cancel:          Set when the download should stop at the next chunk and save its progress.
     """
 
-    # Set starting status
-    download.status = DownloadStatus.STARTING
+    # Check not cancelled whilst waiting
+    if cancel.is_set():
+        download.set_cancelled()
+        return
+
+    # Check whether a previous run finished downloading to the staging directory but did not move the podcast
+    if download.staging_path and os.path.isfile(download.staging_path):
+        mover.submit(download)
+        return
 
-    # Get download response
+    # Get download response, from a source which may have been resolved ahead of time
     try:
-        http_download_response = web_provider.get_podcast_downloader(download.podcast)
+        if resolver is not None:
+            podcast_src = resolver.claim(download)
+        else:
+            download.status = DownloadStatus.STARTING
+            podcast_src = None
+
+        http_download_response, start_byte = get_download_response(download, web_provider, podcast_src)
     except PodcastProviderError as err:
         # Error whilst logging on
         download.set_error(str(err))
         return
+    except requests.RequestException as err:
+        download.set_error(f"Could not get podcast - Connection failed: {err}")
+        return
 
     # Get download size
     download.status = DownloadStatus.DOWNLOADING
     download.total_size = int(http_download_response.headers['Content-Length'])
 
-    # Write to file with partial extension
-    with open(download.download_path + ".partial", "wb") as f:
-        for chunk in http_download_response:
-            f.write(chunk)
-            download.progress += len(chunk)
+    # Check whether the download is being resumed
+    partial_path = download.partial_path
+    if http_download_response.status_code == 206:
+        # Writing a range from anywhere else would corrupt the podcast, so start again on the next run
+        if not http_download_response.headers.get("Content-Range", "").startswith(f"bytes {start_byte}-"):
+            http_download_response.close()
+            if os.path.isfile(partial_path + ".offset"):
+                os.remove(partial_path + ".offset")
+            download.set_error("Could not resume download - Service responded with the wrong range")
+            return
+
+        download.progress = start_byte
+        download.total_size += start_byte
+
+    # Write to file with partial extension, on a separate thread so that slow storage does not stall the network
+    cancelled = False
+    try:
+        with open(partial_path, "r+b" if download.progress > 0 else "wb") as f:
+            f.seek(download.progress)
+            f.truncate()
+
+            writer = WriteBehindWriter(f, buffer_pool, settings.write_buffer_count)
+            try:
+                for chunk in http_download_response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    if cancel.is_set():
+                        cancelled = True
+                        break
+
+                    writer.write(chunk)
+                    download.progress += len(chunk)
+            finally:
+                # If cancelled, make sure the progress so far is on disk before recording it
+                writer.close(sync=cancelled)
+    except requests.RequestException as err:
+        # Checked before OSError, as requests exceptions are also IOErrors
+        http_download_response.close()
+        download.set_error(f"Could not download podcast - Connection failed: {err}")
+        return
+    except OSError as err:
+        http_download_response.close()
+        download.set_error(f"Could not write podcast - {err}")
+        return
+
+    if cancelled:
+        http_download_response.close()
+        save_resume_offset(partial_path, download.progress)
+        download.set_cancelled()
+        return
+
+    # Check the whole podcast was received
+    if download.progress != download.total_size:
+        download.set_error(f"Incomplete download - received {format_size(download.progress)} of "
+                           f"{format_size(download.total_size)}")
+        return
 
     # Rename completed file
-    os.rename(download.download_path + ".partial", download.download_path)
+    os.rename(partial_path, download.staging_path or download.download_path)
+
+    if os.path.isfile(partial_path + ".offset"):
+        os.remove(partial_path + ".offset")
+
+    # Move to the final location in the background, leaving this thread free for the next download
+    if download.staging_path:
+        mover.submit(download)
+        return
 
     # Mark as complete
     download.set_complete()
@@ -105,15 +281,39 @@ def setup_tui() -> None:
     signal.signal(signal.SIGINT, handle_sigint)
 
 
-def get_settings() -> Profile:
-    """Gets the user settings profile for the application, or exits on failure.
+def parse_arguments() -> argparse.Namespace:
+    """Parses the command line arguments.
 
-    :return: The user settings profile.
+    :return: The parsed arguments.
     """
 
-    settings_path: str = "~/lecture-hoarder-settings.yaml"
-    if len(sys.argv) > 1:
-        settings_path = sys.argv[1]  # User has specified custom settings file location
+    parser = argparse.ArgumentParser(prog="lecturehoarder",
+                                     description="Downloads lecture podcasts from the University of Manchester video "
+                                                 "portal.")
+    parser.add_argument("settings_path", nargs="?", default="~/lecture-hoarder-settings.yaml",
+                        help="the settings file to use (default: %(default)s)")
+    parser.add_argument("--cache-server", action="store_true",
+                        help="run a podcast cache server for other installations on the local network")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_PATH, metavar="PATH",
+                        help="profile the run, writing PATH.pstats and PATH.collapsed (default PATH: %(const)s)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also write PATH.memory.txt with memory allocations at each stage (implies --profile)")
+
+    arguments = parser.parse_args()
+
+    # Memory is only reported alongside the profile
+    if arguments.trace_memory and arguments.profile is None:
+        arguments.profile = DEFAULT_PROFILE_PATH
+
+    return arguments
+
+
+def get_settings(settings_path: str) -> Profile:
+    """Gets the user settings profile for the application, or exits on failure.
+
+    :param settings_path:   The path to the settings file.
+    :return:                The user settings profile.
+    """
 
     settings: Profile = Profile()
     try:
@@ -193,11 +393,15 @@ def print_download_queue(queue: List[Download], settings: Profile) -> int:
     return output_length
 
 
-def print_report(report_complete: List[Download], report_errors: List[Download]) -> None:
+def print_report(complete_count: int, report_errors: List[Download], cancelled_count: int) -> None:
     """Prints a report for the completed downloads."""
 
-    download_string = "downloads" if len(report_complete) != 1 else "download"
-    print(f"{len(report_complete)} {download_string} completed successfully")
+    download_string = "downloads" if complete_count != 1 else "download"
+    print(f"{complete_count} {download_string} completed successfully")
+
+    if cancelled_count > 0:
+        download_string = "downloads" if cancelled_count != 1 else "download"
+        print(f"{cancelled_count} {download_string} cancelled, progress will resume on the next run")
 
     if len(report_errors) == 0:
         print("No errors occurred")
@@ -209,67 +413,28 @@ def print_report(report_complete: List[Download], report_errors: List[Download])
             print(f"* {error_podcast.podcast.name}: {error_podcast.error_message}")
 
 
-def main() -> None:
-    """The main lecture-hoarder sub-routine."""
-
-    # Check python version
-    check_python()
-
-    # Setup command line interface
-    setup_tui()
-
-    # Get user settings profile
-    settings: Profile = get_settings()
-
-    # Initialise podcast provider
-    try:
-        web_provider: PodcastProvider = UomPodcastProvider(settings)
-    except PodcastProviderError as err:
-        # Error initialising provider
-        print(err)
-        sys.exit(3)
-
-    # Get username and password
-    if settings.auto_login:
-        username = settings.username
-        password = settings.password
-    else:
-        username = input("Please enter your username: ")
-        password = getpass.getpass("Please enter your password: ")
-
-    # Attempt log in
-    print("Logging on")
-
-    try:
-        if not web_provider.login(username, password):
-            # Login unsuccessful
-            print("Login incorrect")
-            sys.exit(1)
-    except PodcastProviderError as err:
-        # Error whilst logging on
-        print(err)
-        sys.exit(3)
+def generate_downloads(courses: Iterable[Course], web_provider: PodcastProvider, settings: Profile,
+                       podcast_filter: PodcastFilter) -> Iterator[Download]:
+    """Finds the podcasts that need downloading, one course at a time.
 
-    # Login successful
+    Podcast lists are only requested as more downloads are needed, so only one course's podcasts are held in memory
+    at once.
 
-    # Get list of courses from video page
-    print("Getting course list")
-
-    try:
-        courses = web_provider.get_course_list()
-    except PodcastProviderError as err:
-        # Error whilst getting course list
-        print(err)
-        sys.exit(3)
+    :param courses:         The available courses.
+    :param web_provider:    The podcast provider.
+    :param settings:        The program settings profile.
+    :param podcast_filter:  The course and podcast filter.
+    :return:                The podcasts to download.
+    """
 
-    queue: List[Download] = []  # List of downloads
-    futures = []  # List of executable tasks
+    base_dir = os.path.expanduser(settings.base_dir)
+    staging_dir = os.path.expanduser(settings.staging_dir)
 
     for course in courses:
         # For each course
 
         # Check if course is ignored
-        if settings.exclude and re.match(settings.exclude, course.name):
+        if not podcast_filter.is_course_included(course):
             print("-" * (9 + len(course.name)))
             print(f"Ignoring {course.name}")
             continue
@@ -279,8 +444,7 @@ def main() -> None:
         print(f"Getting podcasts for {course.name}")
         print("-" * (21 + len(course.name)))
 
-        course_dir = os.path.expanduser(os.path.join(settings.base_dir, filter_path_name(course.series),
-                                                     filter_path_name(course.name)))
+        course_dir = os.path.join(base_dir, filter_path_name(course.series), filter_path_name(course.name))
         os.makedirs(course_dir, exist_ok=True)
 
         try:
@@ -290,74 +454,186 @@ def main() -> None:
             print(err)
             continue
 
-        podcast_no = len(podcasts) + 1
-        for podcast in podcasts:
-            # For each podcast
+        # Number podcasts before filtering, so file names stay the same regardless of the filters used
+        numbered_podcasts = zip(range(len(podcasts), 0, -1), podcasts)
+        included_podcasts = list(podcast_filter.filter_podcasts(numbered_podcasts))
 
-            podcast_no -= 1
+        if len(included_podcasts) < len(podcasts):
+            print(f"Ignoring {len(podcasts) - len(included_podcasts)} podcasts (filtered)")
+
+        for podcast_no, podcast in included_podcasts:
+            # For each podcast
 
             # Check podcast not already downloaded
-            download_path = os.path.expanduser(os.path.join(course_dir,
-                                                            f"{podcast_no:02d} - {filter_path_name(podcast.name)}.mp4"))
+            download_path = os.path.join(course_dir, f"{podcast_no:02d} - {filter_path_name(podcast.name)}.mp4")
             if os.path.isfile(download_path):
                 print(f"Skipping podcast {podcast.name} (already exists)")
                 continue
 
+            # Download to the staging directory first, if there is one
+            staging_path = None
+            if settings.staging_dir:
+                staging_path = os.path.join(staging_dir, os.path.relpath(download_path, base_dir))
+                os.makedirs(os.path.dirname(staging_path), exist_ok=True)
+
             # Podcast not yet downloaded, add to queue
             print(f"Queuing podcast {podcast.name}")
-            queue.append(Download(podcast, download_path))
+            yield Download(podcast, download_path, staging_path)
 
-    # Start downloads
-    print("--------------------")
-    print("Downloading podcasts")
-    print("--------------------")
 
-    # Terminate early if nothing in queue
-    if len(queue) == 0:
-        print("Nothing to do")
-        sys.exit(0)
+def get_filter(settings: Profile) -> PodcastFilter:
+    """Gets the course and podcast filter from the user settings profile, or exits on failure.
+
+    :param settings:    The program settings profile.
+    :return:            The course and podcast filter.
+    """
+
+    try:
+        return PodcastFilter(settings)
+    except re.error as err:
+        print(f"Could not load settings file - invalid filter pattern \"{err.pattern}\": {err}")
+        sys.exit(2)
+
+
+def run_cache_server(settings: Profile, web_provider: PodcastProvider) -> None:
+    """Serves podcasts to other lecture-hoarder installations until terminated.
+
+    :param settings:        The program settings profile.
+    :param web_provider:    The logged in podcast provider, used to fetch podcasts missing from the cache.
+    """
+
+    cache = PodcastCache(settings.cache_dir, web_provider)
+
+    try:
+        server = PodcastCacheServer(settings.cache_server_host, settings.cache_server_port, cache)
+    except OSError as err:
+        print(f"Could not start cache server - {err}")
+        sys.exit(3)
+
+    print(f"Serving podcast cache from {cache.cache_dir} on {settings.cache_server_host}:{settings.cache_server_port}")
+    server.serve_forever()
+
+
+def download_queue(queue: List[Download], downloads: Iterator[Download], web_provider: PodcastProvider,
+                   settings: Profile, executor: concurrent.futures.Executor) -> bool:
+    """Downloads the queued podcasts, queueing more from the remaining downloads as room becomes available.
+
+    :param queue:           The first downloads to start, which are displayed whilst in progress.
+    :param downloads:       The remaining downloads, queued once there is room in the download window.
+    :param web_provider:    The podcast provider.
+    :param settings:        The program settings profile.
+    :param executor:        Runs the downloads.
+
+    :return: True if every download and move has stopped, False if any did not stop in time after being cancelled.
+    """
 
     # Print all downloads
     output_length: int = print_download_queue(queue, settings)
 
+    # Sigint now cancels the downloads
+    downloading_event.set()
+    cancel_deadline = None
+
+    # Resolves the sources of upcoming downloads whilst earlier downloads are in progress. With a cache server, sources
+    # are only resolved for podcasts the cache server cannot supply, so the video service is not contacted needlessly
+    resolver = None
+    if settings.lookahead_downloads > 0 and not settings.cache_server_url:
+        resolver = PodcastResolver(lambda x: web_provider.get_podcast_source(x.podcast), settings.lookahead_downloads)
+
+    # Moves completed downloads out of the staging directory
+    mover = PodcastMover(settings.concurrent_moves, cancel_event) if settings.staging_dir else None
+
+    # Write buffers are recycled between downloads, with enough for every running download to use all of its buffers
+    buffer_pool = WriteBufferPool(settings.write_buffer_size,
+                                  max(settings.concurrent_downloads, 1) * max(settings.write_buffer_count, 2))
+
     # Add tasks
-    with concurrent.futures.ThreadPoolExecutor(max_workers=settings.concurrent_downloads) as executor:
+    window_size = max(settings.max_queued_downloads, settings.concurrent_downloads)
+    futures: Dict[concurrent.futures.Future, Download] = {}  # Downloads waiting or in progress
+    complete_count = 0
+    cancelled_count = 0
+    report_errors: List[Download] = []
+    try:
         for download in queue:
-            futures.append(executor.submit(download_podcast, download, web_provider))
+            futures[executor.submit(download_podcast, download, web_provider, settings, resolver, mover, buffer_pool,
+                                    cancel_event)] = download
 
         # Loop until all downloads completed
-        complete_downloads = 0
-        total_downloads = len(queue)
-        report_complete: List[Download] = []
-        report_errors: List[Download] = []
-        while complete_downloads < total_downloads:
-            # Check whether there are any remaining downloads
-            complete_downloads = 0
-            for future in futures:
-                if future.done():
-                    complete_downloads += 1
+        while True:
+            # Stop waiting downloads when cancelled, running downloads stop themselves at the next chunk
+            if cancel_event.is_set() and cancel_deadline is None:
+                cancel_deadline = time.time() + CANCEL_TIMEOUT
+                for future in futures:
+                    future.cancel()
+                if resolver is not None:
+                    resolver.cancel()
+                if mover is not None:
+                    mover.cancel()
+                for download in queue:
+                    if download.status == DownloadStatus.WAITING:
+                        download.set_cancelled()
+
+            # Give up waiting for downloads that do not stop in time
+            if cancel_deadline is not None and time.time() > cancel_deadline:
+                break
+
+            # Stop tracking finished downloads, reporting any unexpected error against its download
+            for future in [future for future in futures if future.done()]:
+                download = futures.pop(future)
+                if not future.cancelled() and future.exception() is not None:
+                    download.set_error(f"Unexpected error - {future.exception()!r}")
 
             # Reset cursor
             print(f"\033[{output_length}F\033[0J", end="")
 
+            # Queue more downloads if there is room, any course progress is printed above the download list
+            if not cancel_event.is_set():
+                in_progress = len(futures) + (mover.pending if mover is not None else 0)
+                for download in itertools.islice(downloads, max(window_size - in_progress, 0)):
+                    queue.append(download)
+                    futures[executor.submit(download_podcast, download, web_provider, settings, resolver, mover,
+                                            buffer_pool, cancel_event)] = download
+
+            # Resolve the next waiting downloads ahead of time, apart from those that only need moving
+            if resolver is not None and not cancel_event.is_set():
+                for download in queue:
+                    if download.status == DownloadStatus.WAITING and \
+                            not (download.staging_path and os.path.isfile(download.staging_path)):
+                        resolver.prefetch(download)
+
             # Remove stale downloads
+            now = time.time()
             for download in queue:
-                if download.status == DownloadStatus.COMPLETE and time.time() - download.completion_time > 3:
-                    report_complete.append(download)
-                    queue.remove(download)
-                if download.status == DownloadStatus.ERROR and time.time() - download.completion_time > 3:
+                if download.completion_time is None or now - download.completion_time <= STALE_DOWNLOAD_TIME:
+                    continue
+
+                if download.status == DownloadStatus.COMPLETE:
+                    complete_count += 1
+                elif download.status == DownloadStatus.ERROR:
                     report_errors.append(download)
-                    queue.remove(download)
+                elif download.status == DownloadStatus.CANCELLED:
+                    cancelled_count += 1
+            queue = [download for download in queue
+                     if download.completion_time is None or now - download.completion_time <= STALE_DOWNLOAD_TIME]
 
             # Print all downloads
             output_length = print_download_queue(queue, settings)
 
-            # Wait
-            time.sleep(0.3)
+            # Check whether there are any remaining downloads
+            if len(futures) == 0 and (mover is None or mover.pending == 0):
+                break
 
-        # Wait for futures to complete (and cause amy exceptions to be raised)
-        for idx, future in enumerate(concurrent.futures.as_completed(futures)):
-            future.result()
+            # Wait
+            time.sleep(REFRESH_INTERVAL)
+    finally:
+        # Downloads that have not started are dropped, rather than left to run unseen
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+        if resolver is not None:
+            resolver.shutdown()
+        if mover is not None:
+            mover.shutdown()
 
     # Reset cursor
     print(f"\033[{output_length}F\033[0J", end="")
@@ -365,14 +641,132 @@ def main() -> None:
     # Add remaining downloads to report
     for download in queue:
         if download.status == DownloadStatus.COMPLETE:
-            report_complete.append(download)
+            complete_count += 1
         elif download.status == DownloadStatus.ERROR:
             report_errors.append(download)
+        elif download.status == DownloadStatus.CANCELLED:
+            cancelled_count += 1
+        elif cancel_deadline is not None:
+            report_errors.append(download)
+            download.error_message = "Did not stop in time after being cancelled"
         else:
             print(f"Unexpected status [{download.status.name}] for completed podcast {download.podcast.name}")
 
     # Print report
-    print_report(report_complete, report_errors)
+    print_report(complete_count, report_errors, cancelled_count)
+
+    # Check whether any downloads or moves did not stop in time
+    return len(futures) == 0 and (mover is None or mover.pending == 0)
+
+
+def main() -> None:
+    """The main lecture-hoarder sub-routine."""
+
+    # Check python version
+    check_python()
+
+    # Parse command line arguments
+    arguments = parse_arguments()
+
+    # Start profiling, if requested
+    profiler = RunProfiler(arguments.profile, arguments.trace_memory)
+    profiler.start()
+    atexit.register(profiler.stop)
+
+    if profiler.enabled and not profiler.separate_thread_stats:
+        print(f"Warning: on Python 3.12 and later, {profiler.output_path}.pstats merges calls from all threads and is "
+              f"unreliable for worker threads - use {profiler.output_path}.collapsed instead")
+
+    # Setup command line interface
+    setup_tui()
+
+    # Get user settings profile
+    settings: Profile = get_settings(arguments.settings_path)
+
+    # Compile course and podcast filters
+    podcast_filter: PodcastFilter = get_filter(settings)
+    profiler.mark_stage("settings")
+
+    # The cache server always fetches from upstream itself
+    if arguments.cache_server:
+        settings.cache_server_url = ""
+
+    # Initialise podcast provider
+    try:
+        web_provider: PodcastProvider = UomPodcastProvider(settings)
+    except PodcastProviderError as err:
+        # Error initialising provider
+        print(err)
+        sys.exit(3)
+
+    # Get username and password
+    if settings.auto_login:
+        username = settings.username
+        password = settings.password
+    else:
+        username = input("Please enter your username: ")
+        password = getpass.getpass("Please enter your password: ")
+
+    # Attempt log in
+    print("Logging on")
+
+    try:
+        if not web_provider.login(username, password):
+            # Login unsuccessful
+            print("Login incorrect")
+            sys.exit(1)
+    except PodcastProviderError as err:
+        # Error whilst logging on
+        print(err)
+        sys.exit(3)
+
+    # Login successful
+    profiler.mark_stage("login")
+
+    # Serve the podcast cache instead of downloading, if requested
+    if arguments.cache_server:
+        run_cache_server(settings, web_provider)
+        return
+
+    # Get list of courses from video page
+    print("Getting course list")
+
+    try:
+        courses = web_provider.get_course_list()
+    except PodcastProviderError as err:
+        # Error whilst getting course list
+        print(err)
+        sys.exit(3)
+
+    profiler.mark_stage("course list")
+
+    # Podcasts are found and queued lazily, as room becomes available in the download window
+    downloads: Iterator[Download] = generate_downloads(courses, web_provider, settings, podcast_filter)
+    window_size = max(settings.max_queued_downloads, settings.concurrent_downloads)
+
+    # Queue the first downloads
+    queue: List[Download] = list(itertools.islice(downloads, window_size))  # List of displayed downloads
+
+    # Start downloads
+    print("--------------------")
+    print("Downloading podcasts")
+    print("--------------------")
+
+    # Terminate early if nothing in queue
+    if len(queue) == 0:
+        print("Nothing to do")
+        sys.exit(0)
+
+    # Download podcasts
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=settings.concurrent_downloads)
+    stopped = download_queue(queue, downloads, web_provider, settings, executor)
+    profiler.mark_stage("downloads")
+
+    # Exit without waiting for any downloads or moves that did not stop in time
+    if not stopped:
+        profiler.stop()
+        sys.stdout.flush()
+        os._exit(1)
 
 
 # Run program if started from the command line
@@ -1,5 +1,15 @@
+from logic.podcast_cache import PodcastCache
+from logic.podcast_cache_server import PodcastCacheServer
+from logic.podcast_filter import PodcastFilter
+from logic.podcast_mover import PodcastMover
 from logic.podcast_provider import PodcastProvider
 from logic.podcast_provider_error import PodcastProviderError
+from logic.podcast_resolver import PodcastResolver
+from logic.run_profiler import RunProfiler
 from logic.uom_podcast_provider import UomPodcastProvider
+from logic.write_behind_writer import WriteBehindWriter
+from logic.write_buffer_pool import WriteBufferPool
 
-__all__ = ["PodcastProvider", "PodcastProviderError", "UomPodcastProvider"]
+__all__ = ["PodcastCache", "PodcastCacheServer", "PodcastFilter", "PodcastMover", "PodcastProvider",
+           "PodcastProviderError", "PodcastResolver", "RunProfiler", "UomPodcastProvider", "WriteBehindWriter",
+           "WriteBufferPool"]
@@ -0,0 +1,270 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Iterator, Tuple
+
+from logic.podcast_provider import PodcastProvider
+from logic.podcast_provider_error import PodcastProviderError
+from model import Podcast
+
+
+class PodcastCacheEntry:
+    """A podcast that is currently being fetched into the cache.
+
+    Attributes:
+        condition       Notified whenever the state of the entry changes.
+        partial_path    The file path the podcast is being written to.
+        total_size      The total podcast size, or None if the upstream response has not yet been received.
+        written         The number of bytes written to the partial file so far.
+        complete        True once the podcast has been fully written.
+        cached          True once the partial file has been moved to its final cache path.
+        readers         The number of readers with the partial file open.
+        error_message   The error message, if fetching the podcast failed.
+    """
+
+    condition: threading.Condition = None
+    partial_path: str = None
+    total_size: int = None
+    written: int = 0
+    complete: bool = False
+    cached: bool = False
+    readers: int = 0
+    error_message: str = None
+
+    def __init__(self, partial_path: str):
+        """Creates a new cache entry.
+
+        :param partial_path: The file path the podcast will be written to.
+        """
+
+        self.condition = threading.Condition()
+        self.partial_path = partial_path
+
+
+class PodcastCache:
+    """A disk cache of podcasts, shared between any number of concurrent readers.
+
+    A podcast missing from the cache is fetched from upstream exactly once. Readers requesting it whilst the fetch is
+    in progress follow the partially written file, so all of them receive the bytes as soon as they arrive. The partial
+    file is only moved to its final cache path once no reader has it open, as Windows cannot rename an open file.
+
+    Attributes:
+        cache_dir       The directory cached podcasts are stored in.
+        chunk_size      The number of bytes read and written at a time.
+        web_provider    The podcast provider used to fetch podcasts missing from the cache.
+    """
+
+    cache_dir: str = None
+    chunk_size: int = 64 * 1024
+    web_provider: PodcastProvider = None
+
+    def __init__(self, cache_dir: str, web_provider: PodcastProvider):
+        """Creates a new podcast cache.
+
+        :param cache_dir:       The directory to store cached podcasts in.
+        :param web_provider:    The podcast provider used to fetch podcasts missing from the cache.
+        """
+
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.web_provider = web_provider
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, PodcastCacheEntry] = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_cache_path(self, podcast: Podcast) -> str:
+        """Gets the file path a podcast is cached at.
+
+        :param podcast: The podcast.
+        :return:        The cache file path, keyed by the podcast URL.
+        """
+
+        return os.path.join(self.cache_dir, hashlib.sha256(podcast.url.encode("utf-8")).hexdigest() + ".mp4")
+
+    def open(self, podcast: Podcast) -> Tuple[int, Iterator[bytes]]:
+        """Opens a podcast for reading, fetching it from upstream if it is not already cached.
+
+        :param podcast: The podcast to open.
+
+        :raises PodcastProviderError: If the podcast could not be fetched from upstream.
+
+        :return: The total podcast size and an iterator over its contents.
+        """
+
+        cache_path = self.get_cache_path(podcast)
+
+        with self._lock:
+            entry = self._entries.get(cache_path)
+
+            if entry is None:
+                if os.path.isfile(cache_path):
+                    # Already cached, stream from disk
+                    return os.path.getsize(cache_path), self._read_file(cache_path)
+
+                # Not cached and not in progress, start fetching from upstream
+                entry = PodcastCacheEntry(cache_path + ".partial")
+                self._entries[cache_path] = entry
+                threading.Thread(target=self._fetch, args=(podcast, entry, cache_path), daemon=True).start()
+
+        # Wait for the upstream response
+        with entry.condition:
+            while entry.total_size is None and entry.error_message is None:
+                entry.condition.wait()
+
+            if entry.error_message is not None:
+                raise PodcastProviderError(entry.error_message)
+
+        return entry.total_size, self._follow_file(entry, cache_path)
+
+    def _fetch(self, podcast: Podcast, entry: PodcastCacheEntry, cache_path: str) -> None:
+        """Fetches a podcast from upstream into the cache.
+
+        :param podcast:     The podcast to fetch.
+        :param entry:       The cache entry to update as the fetch progresses.
+        :param cache_path:  The final cache path for the podcast.
+        """
+
+        try:
+            http_download_response = self.web_provider.get_podcast_downloader(podcast)
+
+            with open(entry.partial_path, "wb") as f:
+                with entry.condition:
+                    entry.total_size = int(http_download_response.headers["Content-Length"])
+                    entry.condition.notify_all()
+
+                for chunk in http_download_response.iter_content(self.chunk_size):
+                    f.write(chunk)
+                    f.flush()
+
+                    with entry.condition:
+                        entry.written += len(chunk)
+                        entry.condition.notify_all()
+
+            if entry.written != entry.total_size:
+                raise PodcastProviderError(f"Incomplete download for {podcast.name} - received {entry.written} of "
+                                           f"{entry.total_size} bytes")
+
+            with entry.condition:
+                entry.complete = True
+                entry.condition.notify_all()
+        except (PodcastProviderError, OSError, ValueError, KeyError) as err:
+            with entry.condition:
+                entry.error_message = str(err) or f"Could not fetch {podcast.name}"
+                entry.condition.notify_all()
+
+            self._remove_entry(entry, cache_path)
+            return
+
+        self._move_to_cache(entry, cache_path)
+
+    def _move_to_cache(self, entry: PodcastCacheEntry, cache_path: str) -> None:
+        """Moves a fully written podcast to its final cache path, unless a reader still has the partial file open.
+
+        The last reader to close the partial file calls this again, so the podcast is moved once it is no longer open.
+
+        :param entry:       The cache entry for the podcast.
+        :param cache_path:  The final cache path for the podcast.
+        """
+
+        with entry.condition:
+            if not entry.complete or entry.cached or entry.readers > 0:
+                return
+
+            try:
+                os.replace(entry.partial_path, cache_path)
+                entry.cached = True
+            except OSError:
+                # Leave the podcast uncached, the next request fetches it again
+                pass
+
+        self._remove_entry(entry, cache_path)
+
+    def _remove_entry(self, entry: PodcastCacheEntry, cache_path: str) -> None:
+        """Stops tracking a cache entry, so that further requests read the cached file or fetch the podcast again.
+
+        :param entry:       The cache entry to remove.
+        :param cache_path:  The final cache path for the podcast.
+        """
+
+        with self._lock:
+            if self._entries.get(cache_path) is entry:
+                del self._entries[cache_path]
+
+    def _read_file(self, path: str) -> Iterator[bytes]:
+        """Reads a complete file from disk.
+
+        :param path:    The file path.
+        :return:        An iterator over the file contents.
+        """
+
+        with open(path, "rb") as stream:
+            chunk = stream.read(self.chunk_size)
+            while chunk:
+                yield chunk
+                chunk = stream.read(self.chunk_size)
+
+    def _follow_file(self, entry: PodcastCacheEntry, cache_path: str) -> Iterator[bytes]:
+        """Reads a file that may still be being written to, waiting for more data until the fetch completes.
+
+        The file is only opened once reading starts, so an iterator that is never read holds nothing open.
+
+        :param entry:       The cache entry for the file.
+        :param cache_path:  The final cache path for the file.
+
+        :raises PodcastProviderError: If the fetch fails before the whole file has been read.
+
+        :return: An iterator over the file contents.
+        """
+
+        # Open the file whilst holding the condition, so it cannot be moved underneath us
+        with entry.condition:
+            if entry.error_message is not None:
+                raise PodcastProviderError(entry.error_message)
+
+            following = not entry.cached
+            if following:
+                stream = open(entry.partial_path, "rb")
+                entry.readers += 1
+
+        # Already moved to the cache before reading started
+        if not following:
+            yield from self._read_file(cache_path)
+            return
+
+        try:
+            yield from self._read_partial_file(entry, stream)
+        finally:
+            stream.close()
+            with entry.condition:
+                entry.readers -= 1
+
+            self._move_to_cache(entry, cache_path)
+
+    def _read_partial_file(self, entry: PodcastCacheEntry, stream) -> Iterator[bytes]:
+        """Reads an open partial file, waiting for more data until the fetch completes.
+
+        :param entry:   The cache entry for the file.
+        :param stream:  The open partial file.
+
+        :raises PodcastProviderError: If the fetch fails before the whole file has been read.
+
+        :return: An iterator over the file contents.
+        """
+
+        while True:
+            chunk = stream.read(self.chunk_size)
+            if chunk:
+                yield chunk
+                continue
+
+            # Reached the end of the data written so far, wait for more
+            with entry.condition:
+                while entry.written <= stream.tell() and not entry.complete and entry.error_message is None:
+                    entry.condition.wait()
+
+                if entry.error_message is not None:
+                    raise PodcastProviderError(entry.error_message)
+
+                if entry.complete and stream.tell() >= entry.written:
+                    return
@@ -0,0 +1,79 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+from logic.podcast_cache import PodcastCache
+from logic.podcast_provider_error import PodcastProviderError
+from model import Podcast
+
+
+class PodcastCacheRequestHandler(BaseHTTPRequestHandler):
+    """Handles podcast requests made to the cache server.
+
+    Podcasts are requested with GET /podcast?url=<podcast URL>&name=<podcast name>, where the podcast URL is a path on
+    the video service.
+    """
+
+    server: "PodcastCacheServer"
+
+    def do_GET(self) -> None:
+        """Streams the requested podcast to the client."""
+
+        request_url = urlsplit(self.path)
+        query = parse_qs(request_url.query)
+
+        if request_url.path != "/podcast" or "url" not in query:
+            self.send_error(404)
+            return
+
+        # Only allow paths on the video service, so the server cannot be used to fetch from other hosts
+        podcast_url = query["url"][0]
+        if not podcast_url.startswith("/") or podcast_url.startswith("//"):
+            self.send_error(400, "Podcast URL must be a path on the video service")
+            return
+
+        podcast = Podcast(query.get("name", query["url"])[0], None, podcast_url)
+
+        try:
+            total_size, chunks = self.server.cache.open(podcast)
+        except PodcastProviderError as err:
+            self.send_error(502, str(err))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(total_size))
+        self.end_headers()
+
+        try:
+            for chunk in chunks:
+                self.wfile.write(chunk)
+        except (PodcastProviderError, ConnectionError):
+            # Upstream failed or client went away, the client will see a short response
+            self.close_connection = True
+        finally:
+            chunks.close()
+
+
+class PodcastCacheServer(ThreadingMixIn, HTTPServer):
+    """An HTTP server sharing a podcast cache with other lecture-hoarder installations on the local network.
+
+    Attributes:
+        cache   The podcast cache being served.
+    """
+
+    daemon_threads = True
+
+    cache: PodcastCache = None
+
+    def __init__(self, host: str, port: int, cache: PodcastCache):
+        """Creates a new cache server.
+
+        :param host:    The host address to listen on.
+        :param port:    The port to listen on.
+        :param cache:   The podcast cache to serve.
+        """
+
+        super().__init__((host, port), PodcastCacheRequestHandler)
+
+        self.cache = cache
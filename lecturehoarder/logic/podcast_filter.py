@@ -0,0 +1,121 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Optional, Pattern, Tuple
+
+from model import Course, Podcast, Profile
+
+
+class PodcastFilter:
+    """Decides which courses and podcasts should be downloaded, using the filters from a settings profile.
+
+    Filters are compiled once up front, so that they can be evaluated cheaply before any requests are made for the
+    courses and podcasts they exclude.
+
+    Attributes:
+        include_courses     Course names must match this pattern to be included, if set.
+        exclude_courses     Course names matching this pattern are excluded, if set.
+        include_podcasts    Podcast names must match this pattern to be included, if set.
+        exclude_podcasts    Podcast names matching this pattern are excluded, if set.
+        date_from           Podcasts from before this date are excluded, if set.
+        date_to             Podcasts from after this date are excluded, if set.
+        max_per_course      The maximum number of podcasts to include for each course, or 0 for no limit.
+    """
+
+    include_courses: Optional[Pattern] = None
+    exclude_courses: Optional[Pattern] = None
+    include_podcasts: Optional[Pattern] = None
+    exclude_podcasts: Optional[Pattern] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    max_per_course: int = 0
+
+    def __init__(self, settings: Profile):
+        """Creates a new filter from the settings profile.
+
+        :param settings: The settings profile containing the filters.
+
+        :raises re.error: If one of the filter patterns is not a valid regex expression.
+        """
+
+        self.include_courses = self.compile_pattern(settings.include)
+        self.exclude_courses = self.compile_pattern(settings.exclude)
+        self.include_podcasts = self.compile_pattern(settings.include_podcasts)
+        self.exclude_podcasts = self.compile_pattern(settings.exclude_podcasts)
+        self.date_from = settings.date_from
+        self.date_to = settings.date_to
+        self.max_per_course = settings.max_per_course
+
+        # Use whichever start date is most recent
+        if settings.max_age_days > 0:
+            max_age_date = date.today() - timedelta(days=settings.max_age_days)
+            if self.date_from is None or max_age_date > self.as_date(self.date_from):
+                self.date_from = max_age_date
+
+    @staticmethod
+    def compile_pattern(pattern: str) -> Optional[Pattern]:
+        """Compiles a filter pattern.
+
+        :param pattern: The regex expression, or an empty string for no filter.
+
+        :raises re.error: If the pattern is not a valid regex expression.
+
+        :return: The compiled pattern, or None if no pattern was given.
+        """
+
+        return re.compile(pattern) if pattern else None
+
+    @staticmethod
+    def as_date(value: date) -> date:
+        """Converts a date or datetime to a date.
+
+        :param value:   The date or datetime.
+        :return:        The date.
+        """
+
+        return value.date() if isinstance(value, datetime) else value
+
+    def is_course_included(self, course: Course) -> bool:
+        """Checks whether a course should be downloaded.
+
+        :param course:  The course to check.
+        :return:        True if the course is included, False otherwise.
+        """
+
+        if self.include_courses and not self.include_courses.match(course.name):
+            return False
+
+        return not (self.exclude_courses and self.exclude_courses.match(course.name))
+
+    def is_podcast_included(self, podcast: Podcast) -> bool:
+        """Checks whether a podcast should be downloaded, ignoring the per course limit.
+
+        :param podcast: The podcast to check.
+        :return:        True if the podcast is included, False otherwise.
+        """
+
+        if self.include_podcasts and not self.include_podcasts.match(podcast.name):
+            return False
+
+        if self.exclude_podcasts and self.exclude_podcasts.match(podcast.name):
+            return False
+
+        if self.date_from and self.as_date(podcast.date) < self.as_date(self.date_from):
+            return False
+
+        return not (self.date_to and self.as_date(podcast.date) > self.as_date(self.date_to))
+
+    def filter_podcasts(self, podcasts: Iterable[Tuple[int, Podcast]]) -> Iterator[Tuple[int, Podcast]]:
+        """Filters the podcasts for a course.
+
+        :param podcasts:    The numbered podcasts for the course, most recent first.
+        :return:            The numbered podcasts that should be downloaded.
+        """
+
+        included = 0
+        for podcast_no, podcast in podcasts:
+            if self.max_per_course and included >= self.max_per_course:
+                return
+
+            if self.is_podcast_included(podcast):
+                included += 1
+                yield podcast_no, podcast
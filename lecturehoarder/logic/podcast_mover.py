@@ -0,0 +1,152 @@
+import concurrent.futures
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+
+from model import Download, DownloadStatus
+
+
+class PodcastMover:
+    """Moves completed downloads from the staging directory to their final location in the background.
+
+    Each podcast is copied next to its final location, verified against the staged copy and then atomically renamed
+    into place, so that an interrupted move never leaves an incomplete podcast at the final location.
+
+    Attributes:
+        chunk_size      The number of bytes copied at a time.
+    """
+
+    chunk_size: int = 1024 * 1024
+
+    def __init__(self, concurrent_moves: int, cancel: threading.Event):
+        """Creates a new podcast mover.
+
+        :param concurrent_moves:    The maximum number of podcasts to move simultaneously. At least 1 is used.
+        :param cancel:              Set when moves should stop, leaving podcasts in the staging directory.
+        """
+
+        self._cancel = cancel
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(concurrent_moves, 1))
+        self._lock = threading.Lock()
+        self._futures: Dict[concurrent.futures.Future, Download] = {}
+
+    @property
+    def pending(self) -> int:
+        """The number of moves that have been submitted but not yet finished."""
+
+        with self._lock:
+            return len(self._futures)
+
+    def submit(self, download: Download) -> None:
+        """Queues a completed download to be moved from its staging path to its download path.
+
+        :param download: The completed download.
+        """
+
+        download.status = DownloadStatus.MOVING
+
+        with self._lock:
+            future = self._executor.submit(self.move, download)
+            self._futures[future] = download
+        future.add_done_callback(self._remove_future)
+
+    def cancel(self) -> None:
+        """Cancels all moves that have not yet started. Moves in progress stop at the next chunk."""
+
+        with self._lock:
+            futures = list(self._futures.items())
+
+        for future, download in futures:
+            if future.cancel():
+                download.set_cancelled()
+
+    def shutdown(self) -> None:
+        """Stops accepting moves, without waiting for moves in progress."""
+
+        self._executor.shutdown(wait=False)
+
+    def move(self, download: Download) -> None:
+        """Moves a completed download from its staging path to its download path.
+
+        :param download: The completed download.
+        """
+
+        temp_path = download.download_path + ".partial"
+
+        try:
+            staged_digest = self._copy(download.staging_path, temp_path)
+
+            if staged_digest is None:
+                # Cancelled, the podcast stays in the staging directory for the next run
+                os.remove(temp_path)
+                download.set_cancelled()
+                return
+
+            # Verify what actually reached the destination before replacing anything
+            if self._hash_file(temp_path) != staged_digest:
+                os.remove(temp_path)
+                download.set_error("Could not move podcast - copy did not match the downloaded file")
+                return
+
+            os.replace(temp_path, download.download_path)
+            os.remove(download.staging_path)
+        except OSError as err:
+            download.set_error(f"Could not move podcast - {err}")
+            return
+
+        download.set_complete()
+
+    def _copy(self, source_path: str, destination_path: str) -> Optional[bytes]:
+        """Copies a file, syncing the copy to disk.
+
+        :param source_path:         The file to copy.
+        :param destination_path:    The path to copy the file to.
+
+        :raises OSError: If the file could not be copied.
+
+        :return: The SHA-256 digest of the copied data, or None if cancelled before the copy completed.
+        """
+
+        digest = hashlib.sha256()
+
+        with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+            chunk = source.read(self.chunk_size)
+            while chunk:
+                if self._cancel.is_set():
+                    return None
+
+                digest.update(chunk)
+                destination.write(chunk)
+                chunk = source.read(self.chunk_size)
+
+            destination.flush()
+            os.fsync(destination.fileno())
+
+        return digest.digest()
+
+    def _hash_file(self, path: str) -> bytes:
+        """Computes the SHA-256 digest of a file.
+
+        :param path:    The file path.
+        :return:        The SHA-256 digest of the file contents.
+        """
+
+        digest = hashlib.sha256()
+
+        with open(path, "rb") as f:
+            chunk = f.read(self.chunk_size)
+            while chunk:
+                digest.update(chunk)
+                chunk = f.read(self.chunk_size)
+
+        return digest.digest()
+
+    def _remove_future(self, future: concurrent.futures.Future) -> None:
+        """Stops tracking a finished move.
+
+        :param future: The finished move.
+        """
+
+        with self._lock:
+            self._futures.pop(future, None)
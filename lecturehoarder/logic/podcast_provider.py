@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Iterator
+from typing import Iterator, Optional
 
 import requests
 
@@ -59,10 +59,28 @@ class PodcastProvider(ABC):
         pass
 
     @abstractmethod
-    def get_podcast_downloader(self, podcast: Podcast) -> requests.Response:
+    def get_podcast_source(self, podcast: Podcast) -> str:
+        """Gets the URL the specified podcast is downloaded from.
+
+        :param podcast: The podcast to get the source for.
+
+        :raises PodcastProviderError: If an error occurs getting the podcast source.
+
+        :return: The podcast source URL.
+        """
+        pass
+
+    @abstractmethod
+    def get_podcast_downloader(self, podcast: Podcast, start_byte: int = 0,
+                               podcast_src: Optional[str] = None) -> requests.Response:
         """Gets the HTTP response for the specified podcast download.
 
-        :param podcast: The podcast to get the download response for.
+        If start_byte is non-zero, the response may have status 206 and contain only the podcast from that byte
+        onwards. A response with status 200 always contains the whole podcast.
+
+        :param podcast:     The podcast to get the download response for.
+        :param start_byte:  The byte to resume the download from.
+        :param podcast_src: The podcast source URL, if already known.
 
         :raises PodcastProviderError: If an error occurs getting the podcast downloader.
         """
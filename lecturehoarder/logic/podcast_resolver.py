@@ -0,0 +1,83 @@
+import concurrent.futures
+import threading
+from typing import Callable, Dict, Optional
+
+from model import Download, DownloadStatus
+
+
+class PodcastResolver:
+    """Resolves the sources of upcoming downloads whilst earlier downloads are still in progress.
+
+    Only the source of each download is resolved ahead of time. The download itself is not requested until the download
+    is started, so no connection is left idle whilst it waits.
+
+    Attributes:
+        lookahead   The maximum number of downloads to resolve ahead of time.
+    """
+
+    lookahead: int = 0
+
+    def __init__(self, resolve: Callable[[Download], str], lookahead: int):
+        """Creates a new podcast resolver.
+
+        :param resolve:     Gets the source URL for a download.
+        :param lookahead:   The maximum number of downloads to resolve ahead of time.
+        """
+
+        self.lookahead = lookahead
+
+        self._resolve = resolve
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=lookahead)
+        self._lock = threading.Lock()
+        self._futures: Dict[Download, concurrent.futures.Future] = {}
+
+    def prefetch(self, download: Download) -> bool:
+        """Starts resolving a download's source, if there is room and the download has not yet started.
+
+        :param download:    The waiting download.
+        :return:            True if the download is being resolved, False otherwise.
+        """
+
+        with self._lock:
+            if len(self._futures) >= self.lookahead or download in self._futures or \
+                    download.status != DownloadStatus.WAITING:
+                return False
+
+            self._futures[download] = self._executor.submit(self._resolve, download)
+            return True
+
+    def claim(self, download: Download) -> Optional[str]:
+        """Marks a download as started and gets its source, waiting for it if it is still being resolved.
+
+        :param download: The download being started.
+
+        :raises PodcastProviderError: If an error occurred resolving the download source.
+        :raises RequestException: If a connection error occurred resolving the download source.
+
+        :return: The download source URL, or None if it was not resolved ahead of time.
+        """
+
+        with self._lock:
+            download.status = DownloadStatus.STARTING
+            future = self._futures.pop(download, None)
+
+        if future is None or future.cancel():
+            return None
+
+        return future.result()
+
+    def cancel(self) -> None:
+        """Cancels all downloads being resolved."""
+
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+
+        for future in futures:
+            future.cancel()
+
+    def shutdown(self) -> None:
+        """Stops resolving downloads, without waiting for those in progress."""
+
+        self.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,186 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import List, Optional
+
+
+class RunProfiler:
+    """Profiles a whole lecture-hoarder run, across the main thread and all worker threads.
+
+    Stopping the profiler writes the following files:
+        <output_path>.pstats        Deterministic cProfile statistics for all threads, for use with pstats or snakeviz.
+                                    See separate_thread_stats for the Python versions where these are reliable.
+        <output_path>.collapsed     Sampled stacks in collapsed format, for use with flamegraph tools.
+        <output_path>.memory.txt    The largest memory allocations at each stage, if memory tracing is enabled.
+
+    Attributes:
+        output_path         The path prefix for the output files, or None if profiling is disabled.
+        trace_memory        If true, memory allocations are traced and reported at each stage.
+        sample_interval     The number of seconds between stack samples.
+        memory_top_count    The number of allocation sites to report at each stage.
+    """
+
+    output_path: Optional[str] = None
+    trace_memory: bool = False
+    sample_interval: float = 0.01
+    memory_top_count: int = 15
+
+    def __init__(self, output_path: Optional[str], trace_memory: bool = False):
+        """Creates a new run profiler.
+
+        :param output_path:     The path prefix for the output files, or None to disable profiling.
+        :param trace_memory:    If true, memory allocations are traced and reported at each stage.
+        """
+
+        self.output_path = output_path
+        self.trace_memory = trace_memory
+
+        self._lock = threading.Lock()
+        self._profilers: List[cProfile.Profile] = []
+        self._samples: Counter = Counter()
+        self._memory_report: List[str] = []
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._snapshot_thread: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        """True if profiling is enabled."""
+
+        return self.output_path is not None
+
+    @property
+    def separate_thread_stats(self) -> bool:
+        """True if each thread gets its own cProfile profiler.
+
+        From Python 3.12, cProfile uses sys.monitoring. Its events are global, so a single profiler sees every thread
+        and interleaves their calls into one call stack. This makes call counts and times unreliable for any code run
+        on more than one thread. The sampled stacks are not affected.
+        """
+
+        return sys.version_info < (3, 12)
+
+    def start(self) -> None:
+        """Starts profiling the current thread and any threads started afterwards."""
+
+        if not self.enabled:
+            return
+
+        if self.trace_memory:
+            tracemalloc.start()
+
+        # Start the sampler before any profiling hooks are installed, so that it is not profiled itself
+        self._sampler = threading.Thread(target=self._sample_stacks, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+
+        if self.separate_thread_stats:
+            threading.setprofile(self._start_thread_profiler)
+
+        profiler = cProfile.Profile()
+        self._profilers.append(profiler)
+        profiler.enable()
+
+    def mark_stage(self, name: str) -> None:
+        """Records the end of a stage of the run, taking a memory snapshot if memory tracing is enabled.
+
+        Must be called from the thread that started the profiler.
+
+        :param name: The name of the stage that has just finished.
+        """
+
+        if not self.enabled or not self.trace_memory:
+            return
+
+        # Keep the snapshot out of the profile and the sampled stacks, as it is not part of the run
+        profiling = not self._stopped.is_set()
+        if profiling:
+            self._profilers[0].disable()
+        self._snapshot_thread = threading.get_ident()
+
+        try:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ])
+            current, peak = tracemalloc.get_traced_memory()
+
+            if self._last_snapshot is None:
+                top_stats = snapshot.statistics("lineno")
+            else:
+                top_stats = snapshot.compare_to(self._last_snapshot, "lineno")
+            self._last_snapshot = snapshot
+
+            self._memory_report.append(f"== {name} (current {current / 1000000:.1f} MB, "
+                                       f"peak {peak / 1000000:.1f} MB)")
+            self._memory_report.extend(str(stat) for stat in top_stats[:self.memory_top_count])
+            self._memory_report.append("")
+        finally:
+            self._snapshot_thread = None
+            if profiling:
+                self._profilers[0].enable()
+
+    def stop(self) -> None:
+        """Stops profiling and writes the output files."""
+
+        if not self.enabled or self._stopped.is_set():
+            return
+
+        self._stopped.set()
+        self._profilers[0].disable()
+        threading.setprofile(None)
+        self._sampler.join()
+
+        # Merge statistics from all threads
+        with self._lock:
+            stats = pstats.Stats(*self._profilers)
+        stats.dump_stats(self.output_path + ".pstats")
+
+        with open(self.output_path + ".collapsed", "w") as f:
+            for stack, count in sorted(self._samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        if self.trace_memory:
+            self.mark_stage("exit")
+            tracemalloc.stop()
+
+            with open(self.output_path + ".memory.txt", "w") as f:
+                f.write("\n".join(self._memory_report))
+
+    def _start_thread_profiler(self, frame, event, arg) -> None:
+        """Starts a profiler for a new thread, on the first profiling event in that thread."""
+
+        sys.setprofile(None)
+
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._profilers.append(profiler)
+        profiler.enable()
+
+    def _sample_stacks(self) -> None:
+        """Periodically records the stack of every other thread, until profiling stops.
+
+        A thread taking a memory snapshot is skipped.
+        """
+
+        sampler_id = threading.get_ident()
+
+        while not self._stopped.wait(self.sample_interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id or thread_id == self._snapshot_thread:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                self._samples[";".join(reversed(stack))] += 1
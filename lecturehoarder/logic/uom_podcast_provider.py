@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Iterator
+from typing import Iterator, Optional
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 from logic.podcast_provider import PodcastProvider
 from logic.podcast_provider_error import PodcastProviderError
@@ -13,11 +14,13 @@ class UomPodcastProvider(PodcastProvider):
     """Provides podcasts from the University of Manchester video service.
 
     Attributes:
-        login_service_url           The URL of the login service.
-        session                     The current cookie session, used for maintaining state.
-        video_service_base_url      The base URL of the video service.
+        cache_server_connect_timeout    The number of seconds to wait when connecting to the cache server.
+        login_service_url               The URL of the login service.
+        session                         The current cookie session, used for maintaining state.
+        video_service_base_url          The base URL of the video service.
     """
 
+    cache_server_connect_timeout: float = 5
     login_service_url: str = "https://login.manchester.ac.uk/cas/login"
     video_service_base_url: str = "https://video.manchester.ac.uk"
 
@@ -33,6 +36,10 @@ class UomPodcastProvider(PodcastProvider):
 
         self.session = requests.session()
 
+        # Keep a connection for every download and every download resolved ahead of time
+        pool_size = max(settings_profile.concurrent_downloads + settings_profile.lookahead_downloads, 10)
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+
     def login(self, username: str, password: str) -> bool:
         """Logs the user into the UOM video service.
 
@@ -129,12 +136,14 @@ class UomPodcastProvider(PodcastProvider):
             datetime.strptime(x.find("p", class_="date").string, "%a %b %d %X %Z %Y"),
             x["href"]), podcasts_html)
 
-    def get_podcast_downloader(self, podcast: Podcast) -> requests.Response:
-        """Gets the HTTP response for the specified podcast download.
+    def get_podcast_source(self, podcast: Podcast) -> str:
+        """Gets the URL the specified podcast is downloaded from.
 
-        :param podcast: The podcast to get the download response for.
+        :param podcast: The podcast to get the source for.
 
-        :raises PodcastProviderError: If an error occurs getting the podcast downloader.
+        :raises PodcastProviderError: If an error occurs getting the podcast source.
+
+        :return: The podcast source URL.
         """
 
         # Get podcast webpage
@@ -154,14 +163,63 @@ class UomPodcastProvider(PodcastProvider):
         if not download_button or not download_button["href"]:
             raise PodcastProviderError(f"Could not find download link for podcast {podcast.name}")
 
-        podcast_src = self.video_service_base_url + download_button["href"]
+        return self.video_service_base_url + download_button["href"]
+
+    def get_podcast_downloader(self, podcast: Podcast, start_byte: int = 0,
+                               podcast_src: Optional[str] = None) -> requests.Response:
+        """Gets the HTTP response for the specified podcast download.
+
+        If start_byte is non-zero, the response may have status 206 and contain only the podcast from that byte
+        onwards. A response with status 200 always contains the whole podcast.
+
+        :param podcast:     The podcast to get the download response for.
+        :param start_byte:  The byte to resume the download from.
+        :param podcast_src: The podcast source URL, if already known.
+
+        :raises PodcastProviderError: If an error occurs getting the podcast downloader.
+        """
 
-        # Get podcast
-        get_video_service_podcast = self.session.get(podcast_src, stream=True)
+        # Try the shared cache server first, if configured
+        if self.settings_profile.cache_server_url:
+            cached_podcast = self.get_cached_podcast_downloader(podcast)
+            if cached_podcast is not None:
+                return cached_podcast
+
+        if podcast_src is None:
+            podcast_src = self.get_podcast_source(podcast)
+
+        # Get podcast, resuming from the start byte if possible
+        headers = {"Range": f"bytes={start_byte}-"} if start_byte > 0 else {}
+        get_video_service_podcast = self.session.get(podcast_src, headers=headers, stream=True)
 
         # Check status code valid
-        if get_video_service_podcast.status_code != 200:
+        if get_video_service_podcast.status_code not in (200, 206):
             raise PodcastProviderError(f"Could not get podcast for {podcast.name} - Service responded with "
                                        f"status code {get_video_service_podcast.status_code}")
 
         return get_video_service_podcast
+
+    def get_cached_podcast_downloader(self, podcast: Podcast) -> Optional[requests.Response]:
+        """Gets the HTTP response for the specified podcast download from the shared cache server.
+
+        A separate request is used rather than the current session, so that login cookies are never sent to the cache
+        server.
+
+        :param podcast: The podcast to get the download response for.
+
+        :return: The download response, or None if the cache server is unavailable or could not supply the podcast.
+        """
+
+        try:
+            get_cache_podcast = requests.get(self.settings_profile.cache_server_url.rstrip("/") + "/podcast",
+                                             params={"url": podcast.url, "name": podcast.name},
+                                             stream=True, timeout=(self.cache_server_connect_timeout, None))
+        except requests.RequestException:
+            # Cache server unreachable, fall back to downloading directly
+            return None
+
+        if get_cache_podcast.status_code != 200 or "Content-Length" not in get_cache_podcast.headers:
+            get_cache_podcast.close()
+            return None
+
+        return get_cache_podcast
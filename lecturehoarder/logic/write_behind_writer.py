@@ -0,0 +1,143 @@
+import os
+import queue
+import threading
+from typing import BinaryIO, Optional
+
+from logic.write_buffer_pool import WriteBufferPool
+
+
+class WriteBehindWriter:
+    """Writes to a file on a background thread, so that slow storage does not hold up the caller.
+
+    Written data is coalesced into buffers taken from a shared pool, which are handed to the writer thread once full
+    and returned to the pool once written. When the writer has every buffer it may use waiting to be written, further
+    writes block until one becomes free.
+
+    Attributes:
+        file            The file being written to.
+        bytes_written   The number of bytes written to the file by the writer thread.
+    """
+
+    file: BinaryIO = None
+    bytes_written: int = 0
+
+    def __init__(self, file: BinaryIO, buffer_pool: WriteBufferPool, buffer_count: int):
+        """Creates a new write-behind writer and starts its writer thread.
+
+        :param file:            The file to write to, positioned where writing should start.
+        :param buffer_pool:     The pool to take buffers from. The buffer size sets the size of each write to the file.
+        :param buffer_count:    The number of buffers the writer may use at once, which bounds how much data can be
+                                waiting to be written. At least 2 buffers are used.
+        """
+
+        self.file = file
+
+        self._buffer_pool = buffer_pool
+        self._buffer_slots = threading.BoundedSemaphore(max(buffer_count, 2))
+
+        self._full_buffers: queue.Queue = queue.Queue()
+        self._buffer: Optional[bytearray] = self._take_buffer()
+        self._buffer_fill = 0
+        self._error: Optional[OSError] = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._write_buffers, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def write(self, data: bytes) -> None:
+        """Queues data to be written to the file.
+
+        :param data: The data to write.
+
+        :raises OSError: If an earlier write to the file failed.
+        """
+
+        self._check_error()
+
+        view = memoryview(data)
+        while view:
+            length = min(len(view), len(self._buffer) - self._buffer_fill)
+            self._buffer[self._buffer_fill:self._buffer_fill + length] = view[:length]
+            self._buffer_fill += length
+            view = view[length:]
+
+            if self._buffer_fill == len(self._buffer):
+                self._submit_buffer()
+
+    def close(self, sync: bool = False) -> None:
+        """Writes any remaining data and stops the writer thread. The file itself is left open.
+
+        :param sync: If true, the file is flushed and synced to disk once all data has been written.
+
+        :raises OSError: If a write to the file failed.
+        """
+
+        if not self._closed:
+            self._closed = True
+            if self._buffer_fill > 0:
+                self._full_buffers.put((self._buffer, self._buffer_fill))
+            else:
+                self._return_buffer(self._buffer)
+            self._buffer = None
+
+            self._full_buffers.put(None)
+            self._thread.join()
+
+        self._check_error()
+
+        if sync:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def _submit_buffer(self) -> None:
+        """Hands the current buffer to the writer thread and takes a free one, blocking until one is available."""
+
+        self._full_buffers.put((self._buffer, self._buffer_fill))
+        self._buffer = self._take_buffer()
+        self._buffer_fill = 0
+
+    def _take_buffer(self) -> bytearray:
+        """Takes a buffer from the pool, blocking until the writer may use another buffer and one is available.
+
+        :return: The buffer.
+        """
+
+        self._buffer_slots.acquire()
+        return self._buffer_pool.acquire()
+
+    def _return_buffer(self, buffer: bytearray) -> None:
+        """Returns a buffer to the pool, allowing the writer to take another.
+
+        :param buffer: The buffer.
+        """
+
+        self._buffer_pool.release(buffer)
+        self._buffer_slots.release()
+
+    def _write_buffers(self) -> None:
+        """Writes full buffers to the file until closed, returning each buffer to the pool once written."""
+
+        while True:
+            item = self._full_buffers.get()
+            if item is None:
+                return
+
+            buffer, length = item
+            try:
+                # After an error, keep recycling buffers so the caller does not block before seeing it
+                if self._error is None:
+                    self.file.write(memoryview(buffer)[:length])
+                    self.bytes_written += length
+            except OSError as err:
+                self._error = err
+            finally:
+                self._return_buffer(buffer)
+
+    def _check_error(self) -> None:
+        """Raises the error from the writer thread, if one occurred.
+
+        :raises OSError: If a write to the file failed.
+        """
+
+        if self._error is not None:
+            raise self._error
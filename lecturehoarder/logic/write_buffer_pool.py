@@ -0,0 +1,59 @@
+import queue
+import threading
+
+
+class WriteBufferPool:
+    """A pool of write buffers shared between downloads, so that buffers are recycled rather than allocated afresh for
+    every download.
+
+    Buffers are only allocated when none are free, up to the maximum buffer count. Once every buffer is in use, further
+    requests block until one is returned.
+
+    Attributes:
+        buffer_size     The size of each buffer.
+        buffer_count    The maximum number of buffers.
+        allocated       The number of buffers allocated so far.
+    """
+
+    buffer_size: int = 0
+    buffer_count: int = 0
+    allocated: int = 0
+
+    def __init__(self, buffer_size: int, buffer_count: int):
+        """Creates a new, empty buffer pool.
+
+        :param buffer_size:     The size of each buffer. At least 1 byte is used.
+        :param buffer_count:    The maximum number of buffers. At least 2 buffers are used.
+        """
+
+        self.buffer_size = max(buffer_size, 1)
+        self.buffer_count = max(buffer_count, 2)
+
+        self._lock = threading.Lock()
+        self._free_buffers: queue.Queue = queue.Queue()
+
+    def acquire(self) -> bytearray:
+        """Takes a buffer from the pool, allocating one if none are free and blocking if all are in use.
+
+        :return: The buffer.
+        """
+
+        try:
+            return self._free_buffers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self.allocated < self.buffer_count:
+                self.allocated += 1
+                return bytearray(self.buffer_size)
+
+        return self._free_buffers.get()
+
+    def release(self, buffer: bytearray) -> None:
+        """Returns a buffer to the pool.
+
+        :param buffer: The buffer, which must have been taken from this pool.
+        """
+
+        self._free_buffers.put(buffer)
@@ -4,11 +4,14 @@ class Course:
     Attributes:
         name        The display name of the course.
         url         The URL for the course podcast home page.
+        series      The series the course belongs to, e.g. the academic year.
     """
 
-    name: str = None
-    url: str = None
-    series: str = None
+    __slots__ = ("name", "url", "series")
+
+    name: str
+    url: str
+    series: str
 
     def __init__(self, name: str, url: str, series: str):
         self.name = name
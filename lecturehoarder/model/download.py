@@ -10,6 +10,7 @@ class Download:
     Attributes:
         podcast             The podcast being downloaded.
         download_path       The file path where the podcast will be saved.
+        staging_path        The file path where the podcast is downloaded to before being moved, if staging is used.
         status              The current download status.
         error_message       The error message, if an error has occurred.
         progress            The current download progress.
@@ -17,23 +18,40 @@ class Download:
         completion_time     The time when the podcast download completed / terminated.
     """
 
-    podcast: Podcast = None
-    download_path: str = None
-    status: DownloadStatus = DownloadStatus.WAITING
-    error_message: str = None
-    progress: int = 0
-    total_size: int = 0
-    completion_time: time = None
+    __slots__ = ("podcast", "download_path", "staging_path", "status", "error_message", "progress", "total_size",
+                 "completion_time")
 
-    def __init__(self, podcast: Podcast, download_path: str):
+    podcast: Podcast
+    download_path: str
+    staging_path: str
+    status: DownloadStatus
+    error_message: str
+    progress: int
+    total_size: int
+    completion_time: time
+
+    def __init__(self, podcast: Podcast, download_path: str, staging_path: str = None):
         """Creates a new instance of a podcast download.
 
         :param podcast:         The podcast being downloaded.
         :param download_path:   The path to download the podcast to.
+        :param staging_path:    The path to download the podcast to before moving it to the download path, if any.
         """
 
         self.podcast = podcast
         self.download_path = download_path
+        self.staging_path = staging_path
+        self.status = DownloadStatus.WAITING
+        self.error_message = None
+        self.progress = 0
+        self.total_size = 0
+        self.completion_time = None
+
+    @property
+    def partial_path(self) -> str:
+        """The file path the podcast is written to whilst downloading."""
+
+        return (self.staging_path or self.download_path) + ".partial"
 
     def set_complete(self):
         """Marks the podcast download as being completed."""
@@ -50,3 +68,9 @@ class Download:
         self.status = DownloadStatus.ERROR
         self.error_message = message
         self.completion_time = time.time()
+
+    def set_cancelled(self):
+        """Marks the podcast download as terminated by the user."""
+
+        self.status = DownloadStatus.CANCELLED
+        self.completion_time = time.time()
@@ -9,12 +9,16 @@ class DownloadStatus(Enum):
         WAITING         The download has been queued but not yet started.
         STARTING        The download is initialising.
         DOWNLOADING     The download is currently in progress.
+        MOVING          The download has finished and is being moved from the staging directory.
         COMPLETE        The download has completed successfully.
         ERROR           An error has occurred and the download has terminated.
+        CANCELLED       The download was stopped by the user, with any progress saved for the next run.
     """
 
     WAITING = "Waiting"
     STARTING = "Starting"
     DOWNLOADING = "Downloading"
+    MOVING = "Moving"
     COMPLETE = "Complete"
     ERROR = "Error"
+    CANCELLED = "Cancelled"
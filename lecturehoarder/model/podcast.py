@@ -10,9 +10,11 @@ class Podcast:
         url         The URL for the podcast.
     """
 
-    date: datetime = None
-    name: str = None
-    url: str = None
+    __slots__ = ("date", "name", "url")
+
+    date: datetime
+    name: str
+    url: str
 
     def __init__(self, name: str, date: datetime, url: str):
         self.name = name
@@ -1,5 +1,6 @@
 import yaml
 import os
+from datetime import date
 
 
 class Profile:
@@ -11,8 +12,25 @@ class Profile:
         password                    The auto-login password.
         base_dir                    The base directory to save podcasts to.
         concurrent_downloads        The number of podcasts to download simultaneously.
+        max_queued_downloads        The maximum number of downloads waiting or in progress at once.
+        lookahead_downloads         The number of waiting downloads to resolve ahead of time, or 0 to disable.
+        staging_dir                 A fast local directory to download podcasts to before moving them to base_dir.
+        concurrent_moves            The number of podcasts to move from the staging directory simultaneously.
         progress_bar_size           The display length of download progress bars.
+        include                     A case-sensitive regex expression describing which course names to include.
         exclude                     A case-sensitive regex expression describing which course names to exclude.
+        include_podcasts            A case-sensitive regex expression describing which podcast names to include.
+        exclude_podcasts            A case-sensitive regex expression describing which podcast names to exclude.
+        date_from                   Only download podcasts from on or after this date.
+        date_to                     Only download podcasts from on or before this date.
+        max_age_days                Only download podcasts from the last number of days, or 0 for no limit.
+        max_per_course              The maximum number of podcasts to download for each course, or 0 for no limit.
+        write_buffer_size           The size in bytes of each write made to podcast files.
+        write_buffer_count          The number of write buffers for each download, bounding the data waiting for disk.
+        cache_server_url            The URL of a lecture-hoarder cache server to download podcasts through, if any.
+        cache_dir                   The directory the cache server stores podcasts in.
+        cache_server_host           The host address the cache server listens on.
+        cache_server_port           The port the cache server listens on.
     """
 
     auto_login: bool = False
@@ -20,8 +38,25 @@ class Profile:
     password: str = None
     base_dir: str = "~/Documents/Lectures"
     concurrent_downloads: int = 4
+    max_queued_downloads: int = 16
+    lookahead_downloads: int = 2
+    staging_dir: str = ""
+    concurrent_moves: int = 2
     progress_bar_size: int = 30
+    include: str = ""
     exclude: str = ""
+    include_podcasts: str = ""
+    exclude_podcasts: str = ""
+    date_from: date = None
+    date_to: date = None
+    max_age_days: int = 0
+    max_per_course: int = 0
+    write_buffer_size: int = 1024 * 1024
+    write_buffer_count: int = 8
+    cache_server_url: str = ""
+    cache_dir: str = "~/.lecture-hoarder-cache"
+    cache_server_host: str = "0.0.0.0"
+    cache_server_port: int = 8642
 
     def load_from_file(self, file_path: str) -> None:
         """Loads a settings profile from the specified YAML file.
@@ -56,8 +91,25 @@ class Profile:
         self.load_setting(settings_dict, "password", str)
         self.load_setting(settings_dict, "base_dir", str)
         self.load_setting(settings_dict, "concurrent_downloads", int)
+        self.load_setting(settings_dict, "max_queued_downloads", int)
+        self.load_setting(settings_dict, "lookahead_downloads", int)
+        self.load_setting(settings_dict, "staging_dir", str)
+        self.load_setting(settings_dict, "concurrent_moves", int)
         self.load_setting(settings_dict, "progress_bar_size", int)
+        self.load_setting(settings_dict, "include", str)
         self.load_setting(settings_dict, "exclude", str)
+        self.load_setting(settings_dict, "include_podcasts", str)
+        self.load_setting(settings_dict, "exclude_podcasts", str)
+        self.load_setting(settings_dict, "date_from", date)
+        self.load_setting(settings_dict, "date_to", date)
+        self.load_setting(settings_dict, "max_age_days", int)
+        self.load_setting(settings_dict, "max_per_course", int)
+        self.load_setting(settings_dict, "write_buffer_size", int)
+        self.load_setting(settings_dict, "write_buffer_count", int)
+        self.load_setting(settings_dict, "cache_server_url", str)
+        self.load_setting(settings_dict, "cache_dir", str)
+        self.load_setting(settings_dict, "cache_server_host", str)
+        self.load_setting(settings_dict, "cache_server_port", int)
 
     def load_setting(self, settings_dict: dict, setting_name: str, expected_type: type) -> bool:
         """Loads a single setting from a dictionary, if it exists.